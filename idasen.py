@@ -1,14 +1,14 @@
 import argparse
+import json
 import logging
 import os
-import time
+import tempfile
+from functools import partial
 from subprocess import Popen
-from threading import Thread
-from typing import Callable
+from threading import Lock
+from typing import Callable, Optional
 
 import wx.adv
-import wx.lib.newevent
-import yaml
 
 log = logging.getLogger(__name__)
 log.setLevel(logging.DEBUG)
@@ -20,6 +20,7 @@ log.addHandler(ch)
 
 
 IDASEN_CONFIG_PATH = "~/.config/idasen/idasen.yaml"
+IDASEN_POSITIONS_CACHE_PATH = "~/.config/idasen/idasen_positions.json"
 POSITIONS_TIMES = {
     "stand": 1,
     "sit": 1,
@@ -27,6 +28,10 @@ POSITIONS_TIMES = {
 TRAY_ICON = "icon.png"
 TRAY_TOOLTIP = "Idasen"
 
+_CONFIG_CACHE = {}
+_CONFIG_CACHE_LOCK = Lock()
+_ICON_CACHE = {}
+
 
 def create_menu_item(menu: wx.Menu, label: str, func: Callable):
     item = wx.MenuItem(menu, -1, label)
@@ -36,10 +41,77 @@ def create_menu_item(menu: wx.Menu, label: str, func: Callable):
 
 
 def read_positions_from_idasen_config_file() -> dict[str, int]:
+    """Returns positions from config, parsing the file only when it changed on disk."""
     config_path = os.path.expanduser(IDASEN_CONFIG_PATH)
-    with open(config_path, "r") as file:
-        config = yaml.safe_load(file)
-    return config["positions"]
+    st = os.stat(config_path)
+    key = (config_path, st.st_mtime_ns, st.st_size, st.st_ino)
+    with _CONFIG_CACHE_LOCK:
+        if key in _CONFIG_CACHE:
+            return _CONFIG_CACHE[key]
+        source = [st.st_mtime_ns, st.st_size, st.st_ino]
+        positions = _read_positions_cache_file(source)
+        if positions is None:
+            import yaml
+
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+            with open(config_path, "rb") as file:
+                try:
+                    config = yaml.load(file, Loader=loader)
+                except yaml.YAMLError as e:
+                    raise ValueError(f"Invalid YAML in {config_path}: {e}") from e
+            if not isinstance(config, dict):
+                raise ValueError(f"Config {config_path} is not a mapping")
+            positions = config["positions"]
+            _validate_positions(positions, config_path)
+            _write_positions_cache_file(source, positions)
+        _CONFIG_CACHE.clear()
+        _CONFIG_CACHE[key] = positions
+        return positions
+
+
+def _validate_positions(positions, path: str):
+    """Raises ValueError unless positions map names to numeric heights."""
+    if not isinstance(positions, dict):
+        raise ValueError(f"Positions in {path} are not a mapping")
+    for name, height in positions.items():
+        if not isinstance(name, str):
+            raise ValueError(f"Position name {name!r} in {path} is not a string")
+        if isinstance(height, bool) or not isinstance(height, (int, float)):
+            raise ValueError(f"Height {height!r} of position {name} in {path} is not a number")
+
+
+def _read_positions_cache_file(source: list[int]) -> Optional[dict[str, int]]:
+    """Returns positions from JSON cache file if it was written from config with given stat."""
+    cache_path = os.path.expanduser(IDASEN_POSITIONS_CACHE_PATH)
+    try:
+        with open(cache_path, "r") as file:
+            cache = json.load(file)
+        if cache["source"] != source:
+            return None
+        _validate_positions(cache["positions"], cache_path)
+        return cache["positions"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_positions_cache_file(source: list[int], positions: dict[str, int]):
+    """Atomically writes positions to JSON cache file along with config stat they come from."""
+    cache_path = os.path.expanduser(IDASEN_POSITIONS_CACHE_PATH)
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix=".tmp")
+    except OSError as e:
+        log.warning(f"Could not write positions cache file: {e}")
+        return
+    try:
+        with os.fdopen(fd, "w") as file:
+            json.dump({"source": source, "positions": positions}, file)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        log.warning(f"Could not write positions cache file: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
 
 
 def set_idasen_position(position: str):
@@ -53,35 +125,17 @@ def set_idasen_position(position: str):
 
 EVT_POSITION_CHANGE_ID = wx.NewIdRef()
 
-PositionChangeEvent, EVT_POSITION_CHANGE = wx.lib.newevent.NewCommandEvent()
-PositionTimeoutEvent, EVT_POSITION_TIMEOUT = wx.lib.newevent.NewEvent()
-
-
-class TimeCounter(Thread):
-    """This thread counts time (in minutes) and posts event on timeout."""
+PositionChangeEvent = EVT_POSITION_CHANGE = None
 
-    def __init__(self, notify_window, timeout_event):
-        Thread.__init__(self)
-        self._notify_window = notify_window
-        self._timeout_event = timeout_event
-        self._want_abort = False
 
-    def start(self, time: int):
-        self._sleep_time = time * 60
-        Thread.start(self)
-
-    def run(self):
-        log.debug("Timer started!")
-        time.sleep(self._sleep_time)
-        log.debug("Timeout!")
-        if self._want_abort:
-            return
-        log.debug(f"Posting {self._timeout_event.__class__.__name__}...")
-        wx.PostEvent(self._notify_window, self._timeout_event)
+def _init_events():
+    """Creates custom event classes on first use."""
+    global PositionChangeEvent, EVT_POSITION_CHANGE
+    if PositionChangeEvent is not None:
+        return
+    import wx.lib.newevent
 
-    def abort(self):
-        log.debug("Counting aborted...")
-        self._want_abort = True
+    PositionChangeEvent, EVT_POSITION_CHANGE = wx.lib.newevent.NewCommandEvent()
 
 
 class TaskBarIcon(wx.adv.TaskBarIcon):
@@ -95,12 +149,14 @@ class TaskBarIcon(wx.adv.TaskBarIcon):
         menu = wx.Menu()
         self.add_positions_to_menu(menu)
         menu.AppendSeparator()
+        create_menu_item(menu, "Reload config", self.on_reload_config)
         create_menu_item(menu, "Exit", self.on_exit)
         return menu
 
     def set_icon(self, path):
-        icon = wx.Icon(wx.Bitmap(path))
-        self.SetIcon(icon, TRAY_TOOLTIP)
+        if path not in _ICON_CACHE:
+            _ICON_CACHE[path] = wx.Icon(wx.Bitmap(path))
+        self.SetIcon(_ICON_CACHE[path], TRAY_TOOLTIP)
 
     def on_left_down(self, event):
         print("Tray icon was left-clicked.")
@@ -108,6 +164,9 @@ class TaskBarIcon(wx.adv.TaskBarIcon):
     def on_hello(self, event):
         print("Hello, world!")
 
+    def on_reload_config(self, event):
+        self.frame.reload_config()
+
     def on_exit(self, event):
         wx.CallAfter(self.Destroy)
         self.frame.Close()
@@ -119,34 +178,46 @@ class TaskBarIcon(wx.adv.TaskBarIcon):
         wx.PostEvent(self.frame, new_event)
 
     def add_positions_to_menu(self, menu: wx.Menu):
-        positions = read_positions_from_idasen_config_file()
-        for position_name, height in positions.items():
-            menu.Append
+        for position_name, height in self.frame.positions.items():
             create_menu_item(
                 menu,
                 f"{position_name}  ({height}m)",
-                # lambda position_name: set_idasen_position(position_name),
-                lambda event, position_name=position_name: self.on_position(event, position_name),
+                partial(self.on_position, position_name=position_name),
             )
 
 
 class MainFrame(wx.Frame):
     def __init__(self, parent, id, enable_position_change_nagging=True):
         wx.Frame.__init__(self, parent, id, "Idasen")
+        _init_events()
         self.__position_change_nagging_enabled = enable_position_change_nagging
-        self.__position_change_counter = None
+        self.__position_change_timer = wx.Timer(self)
         self.__position = None
+        self.__positions = {}
+        self.reload_config()
 
         self.Bind(EVT_POSITION_CHANGE, self._change_position)
-        self.Bind(EVT_POSITION_TIMEOUT, self._toggle_position)
+        self.Bind(wx.EVT_TIMER, self._toggle_position, self.__position_change_timer)
 
     @property
     def current_position(self):
         return self.__position
 
+    @property
+    def positions(self):
+        return self.__positions
+
+    def reload_config(self):
+        """Re-reads positions from config file, keeping current ones on failure"""
+        log.debug("Reloading config...")
+        try:
+            self.__positions = read_positions_from_idasen_config_file()
+        except (OSError, ValueError, KeyError) as e:
+            log.error(f"Could not read config file {IDASEN_CONFIG_PATH}: {e}")
+
     def _change_position(self, event):
-        """Sets position and sets up time counter"""
-        if event.position not in read_positions_from_idasen_config_file():
+        """Sets position and sets up position change timer"""
+        if event.position not in self.__positions:
             log.error(f"Position {event.position} is not valid position name")
             return
         log.debug(f"Changing position to {event.position}...")
@@ -156,15 +227,13 @@ class MainFrame(wx.Frame):
             self._start_position_change_counter(event.position)
 
     def _start_position_change_counter(self, position_name):
-        """Creates new time counter and sets it up to proper time."""
+        """Restarts position change timer with proper time."""
         max_time_at_position = POSITIONS_TIMES.get(position_name, None)
         if not max_time_at_position:
             return
-        if self.__position_change_counter:
-            self.__position_change_counter.abort()
-        log.debug(f"Setting counter to {max_time_at_position} minutes...")
-        self.__position_change_counter = TimeCounter(self, PositionTimeoutEvent())
-        self.__position_change_counter.start(max_time_at_position)
+        self.__position_change_timer.Stop()
+        log.debug(f"Setting timer to {max_time_at_position} minutes...")
+        self.__position_change_timer.StartOnce(max_time_at_position * 60 * 1000)
 
     def _toggle_position(self, event):
         """Toggles position from sit to stand and vice-versa"""